@@ -0,0 +1,73 @@
+import json, os, threading
+from .common import Atomic
+
+CHECKPOINT_VERSION = 1
+
+class Checkpointer:
+    """
+    Periodic match checkpoints written off the tick thread:
+      - submit() just stores the latest snapshot (cheap, never blocks on I/O)
+      - A background thread writes it every 'interval' seconds
+      - Writes go to a temp file + fsync + os.replace, so a crash leaves
+        either the previous or the new checkpoint, never a torn one
+    """
+    def __init__(self, path, interval=1.0):
+        self.path = path
+        self.interval = interval
+        self.writes = 0
+        self._latest = Atomic(None)
+        self._written = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="Checkpointer", daemon=True)
+        self._thread.start()
+
+    def submit(self, snap: dict):
+        self._latest.set(snap)
+
+    def clear(self):
+        """Drop pending snapshots and remove the file (match finished, nothing to resume)."""
+        self._latest.set(None)
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def close(self):
+        """Write the last submitted snapshot and stop."""
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._write_latest()
+        self._write_latest()
+
+    def _write_latest(self):
+        snap = self._latest.get()
+        if snap is None or snap is self._written:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snap, f, separators=(',',':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._written = snap
+            self.writes += 1
+        except OSError:
+            pass  # keep the previous checkpoint; retry next interval
+
+
+def load_checkpoint(path):
+    """Return the checkpoint dict at 'path', or None if missing/unreadable/incompatible."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snap = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snap, dict) or snap.get("version") != CHECKPOINT_VERSION:
+        return None
+    return snap
@@ -1,55 +1,204 @@
-import socket, threading, time
-from .common import send_json_line, recv_json_lines, Atomic
+import socket, threading, time, json, selectors, collections
+from .common import encode_json_line, Atomic
+
+RECONNECT_MIN = 0.5   # s, first retry delay
+RECONNECT_MAX = 5.0   # s, backoff cap
 
 class GameClient:
     """
     Lightweight client:
-      - Connects to host
-      - Sends input states
-      - Receives state snapshots
+      - Connects to host (with timeout)
+      - Queues input states; a background selector thread writes them
+      - Receives state snapshots into an Atomic the renderer can poll
+      - Reconnects with exponential backoff if the link drops
+
+    Nothing called from the render loop ever blocks on the socket.
     """
-    def __init__(self, host="127.0.0.1", port=50007):
+    def __init__(self, host="127.0.0.1", port=50007, connect_timeout=5.0, max_queue=32, reconnect=True):
         self.host = host
         self.port = port
+        self.connect_timeout = connect_timeout
+        self.reconnect = reconnect
         self.sock = None
-        self._recv_thread = None
+        self._io_thread = None
         self._stop = threading.Event()
         self.state = Atomic(None)      # latest state from server
         self.game_over = Atomic(None)  # {"winner":..., "score":...}
+        self.connected = False
 
-    def connect(self):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.connect((self.host, self.port))
-        send_json_line(self.sock, {"type":"hello","who":"client"})
-        self._recv_thread = threading.Thread(target=self._recv_loop, name="ClientRecv", daemon=True)
-        self._recv_thread.start()
+        # Outgoing queue of (enqueue_time, bytes); oldest inputs dropped when full
+        self._outq = collections.deque(maxlen=max_queue)
+        self._out = bytearray()
+        self._out_t = None
+        self._rbuf = bytearray()
 
-    def _recv_loop(self):
-        try:
-            for msg in recv_json_lines(self.sock):
-                t = msg.get("type")
-                if t in ("settings","start","state"):
-                    self.state.set(msg)
-                elif t == "game_over":
-                    self.game_over.set(msg)
-                    break
-        except Exception:
-            pass
-        finally:
-            try:
-                self.sock.close()
-            except: pass
+        # Self-pipe to wake the selector when an input is queued
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+
+        # Stats
+        self.dropped_inputs = 0
+        self.reconnects = 0
+        self.send_latency = 0.0      # s, last enqueue -> fully written
+        self.send_latency_avg = 0.0  # s, moving average
+        self.last_error = None       # why the link last dropped / a reconnect failed
+
+    def connect(self, timeout=None):
+        """Open the first connection (raises on failure/timeout), then start the I/O thread."""
+        self._open_socket(self.connect_timeout if timeout is None else timeout)
+        self._io_thread = threading.Thread(target=self._io_loop, name="ClientIO", daemon=True)
+        self._io_thread.start()
 
     def send_input(self, keys: dict):
         # keys: {"bottom":-1|0|1, "left":-1|0|1}
+        if len(self._outq) == self._outq.maxlen:
+            self.dropped_inputs += 1
+        self._outq.append((time.perf_counter(), encode_json_line({"type":"input","keys":keys})))
         try:
-            send_json_line(self.sock, {"type":"input","keys":keys})
-        except Exception:
-            pass
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # selector is already due to wake up
+
+    def stats(self):
+        return {
+            "connected": self.connected,
+            "queue_depth": len(self._outq),
+            "dropped_inputs": self.dropped_inputs,
+            "send_latency": self.send_latency,
+            "send_latency_avg": self.send_latency_avg,
+            "reconnects": self.reconnects,
+            "last_error": self.last_error,
+        }
 
     def close(self):
         self._stop.set()
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+        if self._io_thread and self._io_thread is not threading.current_thread():
+            self._io_thread.join(timeout=1.0)
         try:
             if self.sock:
                 self.sock.close()
         except: pass
+        for s in (self._wake_r, self._wake_w):
+            try:
+                s.close()
+            except: pass
+
+    # --- Internal I/O ---
+    def _open_socket(self, timeout):
+        sock = socket.create_connection((self.host, self.port), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setblocking(False)
+        self._rbuf = bytearray()
+        self._out = bytearray(encode_json_line({"type":"hello","who":"client"}))
+        self._out_t = None
+        self.sock = sock
+        self.connected = True
+
+    def _io_loop(self):
+        backoff = RECONNECT_MIN
+        while not self._stop.is_set():
+            if self.sock is None:
+                if not self.reconnect or self.game_over.get() is not None:
+                    break
+                if self._stop.wait(backoff):
+                    break
+                backoff = min(backoff * 2, RECONNECT_MAX)
+                try:
+                    self._open_socket(self.connect_timeout)
+                except OSError as e:
+                    self.last_error = repr(e)
+                    continue
+                self.reconnects += 1
+            backoff = RECONNECT_MIN
+            self._serve(self.sock)
+
+    def _serve(self, sock):
+        sel = selectors.DefaultSelector()
+        sel.register(self._wake_r, selectors.EVENT_READ)
+        sel.register(sock, selectors.EVENT_READ)
+        events_now = selectors.EVENT_READ
+        try:
+            while not self._stop.is_set():
+                want = selectors.EVENT_READ
+                if self._out or self._outq:
+                    want |= selectors.EVENT_WRITE
+                if want != events_now:
+                    sel.modify(sock, want)
+                    events_now = want
+                for key, mask in sel.select(timeout=0.5):
+                    if key.fileobj is self._wake_r:
+                        try:
+                            while self._wake_r.recv(4096):
+                                pass
+                        except (BlockingIOError, OSError):
+                            pass
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        try:
+                            data = sock.recv(65536)
+                        except BlockingIOError:
+                            data = None  # spurious wakeup; nothing to read yet
+                        if data is not None:
+                            if not data:
+                                self.last_error = "connection closed by server"
+                                return
+                            if self._on_data(data):
+                                return  # game over
+                    if mask & selectors.EVENT_WRITE:
+                        self._flush(sock)
+        except OSError as e:
+            self.last_error = repr(e)  # link dropped; _io_loop decides whether to reconnect
+        finally:
+            sel.close()
+            self.connected = False
+            try:
+                sock.close()
+            except: pass
+            self.sock = None
+
+    def _flush(self, sock):
+        while True:
+            if not self._out:
+                if not self._outq:
+                    return
+                self._out_t, data = self._outq.popleft()
+                self._out = bytearray(data)
+            try:
+                n = sock.send(self._out)
+            except BlockingIOError:
+                return
+            del self._out[:n]
+            if self._out:
+                return  # socket buffer full; wait for next EVENT_WRITE
+            if self._out_t is not None:
+                lat = time.perf_counter() - self._out_t
+                self.send_latency = lat
+                self.send_latency_avg += 0.1 * (lat - self.send_latency_avg)
+                self._out_t = None
+
+    def _on_data(self, data):
+        """Feed received bytes; returns True once game_over arrives."""
+        self._rbuf += data
+        while True:
+            i = self._rbuf.find(b"\n")
+            if i < 0:
+                return False
+            line = bytes(self._rbuf[:i]).strip()
+            del self._rbuf[:i + 1]
+            if not line:
+                continue
+            try:
+                msg = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            t = msg.get("type")
+            if t in ("settings","start","state"):
+                self.state.set(msg)
+            elif t == "game_over":
+                self.game_over.set(msg)
+                return True
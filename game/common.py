@@ -1,4 +1,5 @@
 import json, threading, random, math, time, socket
+from array import array
 
 # --- Constants ---
 WIDTH = 600
@@ -19,6 +20,12 @@ PLAYER_EDGES = {
     "B": ["bottom", "left"]
 }
 
+# Integer edge ids used by the server's internal state (names only at the wire boundary)
+EDGE_TOP, EDGE_RIGHT, EDGE_BOTTOM, EDGE_LEFT = range(4)
+EDGE_NAMES = ("top", "right", "bottom", "left")
+# Length of the track each paddle moves along, indexed by edge id
+EDGE_SPAN = (WIDTH, HEIGHT, WIDTH, HEIGHT)
+
 # For convenience: orientation of each edge
 EDGE_ORIENT = {
     "top": "h",     # horizontal paddle, moves along x
@@ -41,9 +48,11 @@ class Atomic:
             self._v = v
 
 # --- JSON line helpers ---
+def encode_json_line(obj: dict) -> bytes:
+    return (json.dumps(obj, separators=(',',':')) + "\n").encode("utf-8")
+
 def send_json_line(sock: socket.socket, obj: dict):
-    data = (json.dumps(obj, separators=(',',':')) + "\n").encode("utf-8")
-    sock.sendall(data)
+    sock.sendall(encode_json_line(obj))
 
 def recv_json_lines(sock: socket.socket):
     """Generator that yields decoded JSON objects per line from a blocking socket."""
@@ -77,11 +86,33 @@ def random_ball_velocity():
     vy = BALL_SPEED * math.sin(angle)
     return vx, vy
 
+class Ball:
+    """Ball record; converted to {"x","y","vx","vy"} only when serialized."""
+    __slots__ = ("x", "y", "vx", "vy")
+
+    def __init__(self, x, y, vx, vy):
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+
+    def reset(self):
+        self.x = WIDTH/2
+        self.y = HEIGHT/2
+        self.vx, self.vy = random_ball_velocity()
+
+    def to_dict(self):
+        return {"x": self.x, "y": self.y, "vx": self.vx, "vy": self.vy}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["x"], d["y"], d["vx"], d["vy"])
+
 def make_initial_balls(n):
     balls = []
     for _ in range(n):
         vx, vy = random_ball_velocity()
-        balls.append({"x": WIDTH/2, "y": HEIGHT/2, "vx": vx, "vy": vy})
+        balls.append(Ball(WIDTH/2, HEIGHT/2, vx, vy))
     return balls
 
 def paddle_rect(edge, pos):
@@ -104,28 +135,12 @@ def paddle_rect(edge, pos):
         return WIDTH - PADDLE_THICK, y1, WIDTH, y2
     raise ValueError("invalid edge")
 
-def rect_contains_x(r, x):
-    return r[0] <= x <= r[2]
-
-def rect_contains_y(r, y):
-    return r[1] <= y <= r[3]
-
-def reflect_ball(ball, axis):
-    if axis == "x":
-        ball["vx"] = -ball["vx"]
-    else:
-        ball["vy"] = -ball["vy"]
+def initial_paddles():
+    # center paddles; array of positions indexed by edge id
+    return array("d", [span/2 for span in EDGE_SPAN])
 
-def reset_ball(ball):
-    ball["x"] = WIDTH/2
-    ball["y"] = HEIGHT/2
-    ball["vx"], ball["vy"] = random_ball_velocity()
+def paddles_to_dict(paddles):
+    return {name: paddles[i] for i, name in enumerate(EDGE_NAMES)}
 
-def initial_paddles():
-    # center paddles
-    return {
-        "top": WIDTH/2,
-        "bottom": WIDTH/2,
-        "left": HEIGHT/2,
-        "right": HEIGHT/2
-    }
+def paddles_from_dict(d):
+    return array("d", [float(d[name]) for name in EDGE_NAMES])
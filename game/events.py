@@ -0,0 +1,162 @@
+import json, os, queue, sqlite3, threading, time, uuid
+
+class EventBus:
+    """
+    Structured match events (hit, score, pause, game_over):
+      - emit() never blocks: events go into a bounded queue
+      - When the queue is full the event is dropped and counted ('dropped')
+      - Batches the sink fails to write are counted separately ('write_errors')
+      - A background writer drains the queue in batches into a sink
+
+    With no sink and no subscribers, emit() is a no-op.
+    """
+    def __init__(self, sink=None, maxsize=4096, batch_size=256, flush_interval=0.5):
+        self.sink = sink
+        self.match_id = uuid.uuid4().hex[:12]
+        self.dropped = 0        # overflow drops in emit()
+        self.write_errors = 0   # events lost to sink.write failures (writer thread only)
+        self.written = 0
+        self._count_lock = threading.Lock()  # emit() runs on the tick and render threads
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._subscribers = []
+        self._q = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._thread = None
+        if sink is not None:
+            self._start()
+
+    def subscribe(self, callback):
+        """callback(batch) is called on the writer thread with each list of events."""
+        self._subscribers.append(callback)
+        if self._thread is None:
+            self._start()
+
+    def emit(self, kind, t=None, **fields):
+        # t: match time in seconds (caller's clock); ts: wall clock
+        if self._thread is None:
+            return
+        ev = {"type": kind, "match": self.match_id, "t": t, "ts": time.time()}
+        ev.update(fields)
+        try:
+            self._q.put_nowait(ev)
+        except queue.Full:
+            with self._count_lock:
+                self.dropped += 1
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    # --- Writer thread ---
+    def _start(self):
+        self._thread = threading.Thread(target=self._writer_loop, name="EventWriter", daemon=True)
+        self._thread.start()
+
+    def _writer_loop(self):
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch:
+                    self._deliver(batch)
+                elif self._stop.is_set():
+                    break
+        finally:
+            if self.sink is not None:
+                try:
+                    self.sink.close()
+                except Exception:
+                    pass
+
+    def _next_batch(self):
+        try:
+            batch = [self._q.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._q.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _deliver(self, batch):
+        if self.sink is not None:
+            try:
+                self.sink.write(batch)
+                self.written += len(batch)
+            except Exception:
+                self.write_errors += len(batch)
+        for cb in self._subscribers:
+            try:
+                cb(batch)
+            except Exception:
+                pass
+
+
+class JsonlSink:
+    """Append events as JSON lines; rotates to path.1 .. path.N when max_bytes is exceeded."""
+    def __init__(self, path, max_bytes=5_000_000, backups=5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._f = None
+
+    def write(self, batch):
+        if self._f is None:
+            self._f = open(self.path, "a", encoding="utf-8")
+        self._f.write("".join(json.dumps(ev, separators=(',',':')) + "\n" for ev in batch))
+        self._f.flush()
+        if self.max_bytes and self._f.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._f.close()
+        self._f = None
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i+1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+class SqliteSink:
+    """Store events in a local SQLite table; the connection lives on the writer thread."""
+    def __init__(self, path):
+        self.path = path
+        self._db = None
+
+    def write(self, batch):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                " id INTEGER PRIMARY KEY, match TEXT, type TEXT, t REAL, ts REAL, data TEXT)"
+            )
+        rows = [(ev["match"], ev["type"], ev["t"], ev["ts"], json.dumps(ev, separators=(',',':')))
+                for ev in batch]
+        with self._db:
+            self._db.executemany("INSERT INTO events (match, type, t, ts, data) VALUES (?,?,?,?,?)", rows)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def make_sink(path):
+    """Pick a sink from the file extension: .db/.sqlite -> SQLite, anything else -> JSONL."""
+    if not path:
+        return None
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SqliteSink(path)
+    return JsonlSink(path)
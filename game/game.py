@@ -82,8 +82,7 @@ def run_pygame_loop(role: str=None, server=None, client=None, mode: str='network
             inp = get_input_local()
             # apply to server inputs directly
             server.set_input_A({"top": inp['top'], "right": inp['right']})
-            with server._input_lock:
-                server.input_B = {"bottom": inp['bottom'], "left": inp['left']}
+            server.set_input_B({"bottom": inp['bottom'], "left": inp['left']})
             # step physics manually
             # use fixed dt based on clock
             dt = clock.get_time() / 1000.0
@@ -139,6 +138,9 @@ def run_pygame_loop(role: str=None, server=None, client=None, mode: str='network
             if state.get("paused"):
                 draw_text(screen, "PAUSED (P)", (WIDTH//2 - 70, HEIGHT//2 - 12), size=28)
 
+        if client is not None and not client.connected and not game_over:
+            draw_text(screen, "Reconnecting...", (WIDTH//2 - 80, HEIGHT - 40), size=28, color=(255,200,80))
+
         # Game over banner (for client; host gets via state then broadcast too)
         if game_over:
             draw_text(screen, "GAME OVER", (WIDTH//2 - 80, HEIGHT//2 - 30), size=36)
@@ -1,20 +1,31 @@
 import socket, threading, time, traceback
+from array import array
 from .common import (
     WIDTH, HEIGHT, BALL_RADIUS, PADDLE_SPEED, PADDLE_LEN, PADDLE_THICK,
-    send_json_line, recv_json_lines, clamp, reflect_ball, reset_ball,
-    paddle_rect, rect_contains_x, rect_contains_y, make_initial_balls,
-    initial_paddles, PLAYER_EDGES, EDGE_ORIENT, TICK_RATE, Atomic
+    send_json_line, recv_json_lines, clamp, make_initial_balls, Ball,
+    initial_paddles, paddles_to_dict, paddles_from_dict, PLAYER_EDGES, EDGE_ORIENT, TICK_RATE, Atomic,
+    EDGE_TOP, EDGE_RIGHT, EDGE_BOTTOM, EDGE_LEFT, EDGE_NAMES, EDGE_SPAN
 )
+from .events import EventBus
+from .checkpoint import Checkpointer, CHECKPOINT_VERSION
+
+def _axis(v):
+    # sanitize a movement intent to -1/0/1
+    v = int(v)
+    return -1 if v < -1 else (1 if v > 1 else v)
 
 class GameServer:
     """
     Authoritative server:
-      - Accepts one client
+      - Accepts one client (and accepts it again if it reconnects)
       - Steps physics at fixed rate
       - Applies inputs from Player A (local) and Player B (remote)
       - Broadcasts state snapshots
+      - Emits hit/score/pause/game_over events to an optional analytics sink
+      - Periodically checkpoints the match so a restarted host can resume it
     """
-    def __init__(self, port=50007, num_balls=1, target_score=5, time_limit=0):
+    def __init__(self, port=50007, num_balls=1, target_score=5, time_limit=0, event_sink=None,
+                 checkpoint_path=None, checkpoint_interval=1.0):
         self.port = port
         self.num_balls = num_balls
         self.target_score = target_score
@@ -28,21 +39,34 @@ class GameServer:
         # Shared state for host renderer (Player A)
         self.latest_state = Atomic(None)
 
-        # Inputs
-        self.input_A = {"top": 0, "right": 0}   # -1,0,1 movement intents
-        self.input_B = {"bottom": 0, "left": 0}
+        # Inputs: -1,0,1 movement intents indexed by edge id (A: top/right, B: bottom/left)
+        self.inputs = array("b", [0, 0, 0, 0])
 
-        # Protect input_B (comes from network thread)
+        # Protect B's inputs (come from network thread)
         self._input_lock = threading.Lock()
 
-        # Game state (server-owned)
-        self.paddles = initial_paddles()
+        # Game state (server-owned); dicts only at the serialization boundary
+        self.paddles = initial_paddles()          # array of centers, indexed by edge id
         self.balls = make_initial_balls(self.num_balls)
+        self._pad_lo = array("d", [0.0] * 4)      # covered span of each paddle along its edge,
+        self._pad_hi = array("d", [0.0] * 4)      # recomputed once per tick
+        self._update_paddle_bounds()
         self.scoreA = 0
         self.scoreB = 0
         self.paused = False
         self.start_time = None  # set after both players ready
 
+        # Analytics (never blocks the tick thread; see events.EventBus)
+        self.events = EventBus(event_sink)
+        self._rally_hits = 0
+        self._rally_start = 0.0
+        self._sim_time = 0.0  # simulated match time (advanced by _step_balls, works in local mode too)
+
+        # Checkpointing (written off the tick thread; see checkpoint.Checkpointer)
+        self._checkpointer = Checkpointer(checkpoint_path, checkpoint_interval) if checkpoint_path else None
+        self._checkpoint_interval = checkpoint_interval
+        self._resume_elapsed = 0.0  # match time already played before a restore
+
     def start(self):
         self._thread = threading.Thread(target=self._run, name="GameServer", daemon=True)
         self._thread.start()
@@ -51,16 +75,47 @@ class GameServer:
         self._stop.set()
         try:
             if self.client_sock:
+                # shutdown first: the recv thread's makefile() keeps the fd open past close()
+                self.client_sock.shutdown(socket.SHUT_RDWR)
                 self.client_sock.close()
         except: pass
+        self.events.close()
+        if self._checkpointer:
+            self._checkpointer.close()
+
+    def restore(self, snap: dict):
+        """Load a checkpoint (see checkpoint.load_checkpoint) before start()."""
+        self.num_balls = snap["num_balls"]
+        self.target_score = snap["target_score"]
+        self.time_limit = snap["time_limit"]
+        self.paddles = paddles_from_dict(snap["paddles"])
+        self.balls = [Ball.from_dict(b) for b in snap["balls"]]
+        self._update_paddle_bounds()
+        self.scoreA, self.scoreB = snap["score"]
+        self.paused = snap["paused"]
+        self._resume_elapsed = snap["elapsed"]
+        self._sim_time = snap.get("sim_time", snap["elapsed"])
+        self._rally_start = self._sim_time
+        if snap.get("match"):
+            self.events.match_id = snap["match"]
 
     # --- API for host pygame loop ---
     def set_input_A(self, keyvec: dict):
         # keyvec: {"top": -1|0|1, "right": -1|0|1}
-        self.input_A = keyvec
+        self.inputs[EDGE_TOP] = _axis(keyvec.get("top", 0))
+        self.inputs[EDGE_RIGHT] = _axis(keyvec.get("right", 0))
+
+    def set_input_B(self, keyvec: dict):
+        # keyvec: {"bottom": -1|0|1, "left": -1|0|1}
+        bottom = _axis(keyvec.get("bottom", 0))
+        left = _axis(keyvec.get("left", 0))
+        with self._input_lock:
+            self.inputs[EDGE_BOTTOM] = bottom
+            self.inputs[EDGE_LEFT] = left
 
     def toggle_pause(self):
         self.paused = not self.paused
+        self.events.emit("pause", t=self._match_time(), paused=self.paused)
 
     # --- Internal networking ---
     def _accept_client(self, listener):
@@ -77,9 +132,46 @@ class GameServer:
                 return False
         return False
 
-    def _recv_client_loop(self):
+    def _poll_accept(self, listener):
+        """Non-blocking accept for a returning client while the match runs."""
         try:
-            for msg in recv_json_lines(self.client_sock):
+            sock, addr = listener.accept()
+        except (BlockingIOError, socket.timeout):
+            return False
+        except OSError:
+            return False
+        sock.setblocking(True)
+        self.client_sock = sock
+        self.client_addr = addr
+        return True
+
+    def _greet_client(self):
+        """Send settings plus a full keyframe of the current state, then start the recv thread."""
+        sock = self.client_sock
+        try:
+            send_json_line(sock, {
+                "type":"settings",
+                "width": WIDTH, "height": HEIGHT,
+                "num_balls": self.num_balls,
+                "target_score": self.target_score,
+                "time_limit": self.time_limit
+            })
+            if self.start_time is not None:
+                send_json_line(sock, self._make_state_obj(kind="start"))
+        except OSError:
+            # client left during the greeting; wait for the next one
+            try:
+                sock.close()
+            except: pass
+            if self.client_sock is sock:
+                self.client_sock = None
+            return
+        th = threading.Thread(target=self._recv_client_loop, args=(sock,), name="ServerClientRecv", daemon=True)
+        th.start()
+
+    def _recv_client_loop(self, sock):
+        try:
+            for msg in recv_json_lines(sock):
                 if self._stop.is_set():
                     break
                 t = msg.get("type")
@@ -87,25 +179,18 @@ class GameServer:
                     # ignore; we already proceed
                     pass
                 elif t == "input":
-                    # update input_B
-                    with self._input_lock:
-                        # sanitize to -1/0/1
-                        nb = {}
-                        for k in ("bottom","left"):
-                            v = int(msg.get("keys",{}).get(k,0))
-                            if v < -1: v=-1
-                            if v > 1: v=1
-                            nb[k]=v
-                        self.input_B = nb
+                    # update B's inputs (sanitized to -1/0/1)
+                    self.set_input_B(msg.get("keys",{}))
                 else:
                     # ignore unknown
                     pass
         except Exception:
-            # client disconnected or error
-            try:
-                if self.client_sock:
-                    self.client_sock.close()
-            except: pass
+            pass
+        # client disconnected or error (only clear if it wasn't replaced meanwhile)
+        try:
+            sock.close()
+        except: pass
+        if self.client_sock is sock:
             self.client_sock = None
 
     def _broadcast(self, obj):
@@ -123,65 +208,114 @@ class GameServer:
 
     # --- Physics & scoring ---
     def _apply_inputs(self, dt):
-        # Player A
-        self.paddles["top"]   = clamp(self.paddles["top"]   + self.input_A["top"]   * PADDLE_SPEED * dt,   PADDLE_LEN/2, WIDTH - PADDLE_LEN/2)
-        self.paddles["right"] = clamp(self.paddles["right"] + self.input_A["right"] * PADDLE_SPEED * dt,   PADDLE_LEN/2, HEIGHT - PADDLE_LEN/2)
-        # Player B
+        step = PADDLE_SPEED * dt
+        half = PADDLE_LEN/2
+        p, inp = self.paddles, self.inputs
+        lo, hi = self._pad_lo, self._pad_hi
         with self._input_lock:
-            inpB = dict(self.input_B)
-        self.paddles["bottom"] = clamp(self.paddles["bottom"] + inpB["bottom"] * PADDLE_SPEED * dt, PADDLE_LEN/2, WIDTH - PADDLE_LEN/2)
-        self.paddles["left"]   = clamp(self.paddles["left"]   + inpB["left"]   * PADDLE_SPEED * dt, PADDLE_LEN/2, HEIGHT - PADDLE_LEN/2)
+            for e in range(4):
+                v = p[e] + inp[e] * step
+                top = EDGE_SPAN[e] - half
+                v = half if v < half else (top if v > top else v)
+                p[e] = v
+                # paddle rect along its edge, once per tick (v is clamped, so no edge clamp needed)
+                lo[e] = v - half
+                hi[e] = v - half + PADDLE_LEN
+
+    def _update_paddle_bounds(self):
+        # Same span as paddle_rect(); used when paddles are set without _apply_inputs
+        for e in range(4):
+            self._pad_lo[e] = clamp(self.paddles[e] - PADDLE_LEN/2, 0, EDGE_SPAN[e] - PADDLE_LEN)
+            self._pad_hi[e] = self._pad_lo[e] + PADDLE_LEN
 
     def _step_balls(self, dt):
         scored = None  # "A" or "B"
+        missed = None  # edge id the scoring ball got past
+        lo, hi = self._pad_lo, self._pad_hi
+        self._sim_time += dt
         for ball in self.balls:
             # Integrate
-            ball["x"] += ball["vx"] * dt
-            ball["y"] += ball["vy"] * dt
+            ball.x += ball.vx * dt
+            ball.y += ball.vy * dt
 
             # Collisions with edges/paddles:
             # TOP edge (belongs to A)
-            if ball["vy"] < 0 and ball["y"] - BALL_RADIUS <= 0:
-                pr = paddle_rect("top", self.paddles["top"])
-                if rect_contains_x(pr, ball["x"]):
+            if ball.vy < 0 and ball.y - BALL_RADIUS <= 0:
+                if lo[EDGE_TOP] <= ball.x <= hi[EDGE_TOP]:
                     # bounce
-                    ball["y"] = BALL_RADIUS
-                    reflect_ball(ball, "y")
+                    ball.y = BALL_RADIUS
+                    ball.vy = -ball.vy
+                    self._on_hit(EDGE_TOP, ball)
                 else:
                     scored = "B"  # B scores, A loses
+                    missed = EDGE_TOP
             # BOTTOM edge (belongs to B)
-            elif ball["vy"] > 0 and ball["y"] + BALL_RADIUS >= HEIGHT:
-                pr = paddle_rect("bottom", self.paddles["bottom"])
-                if rect_contains_x(pr, ball["x"]):
-                    ball["y"] = HEIGHT - BALL_RADIUS
-                    reflect_ball(ball, "y")
+            elif ball.vy > 0 and ball.y + BALL_RADIUS >= HEIGHT:
+                if lo[EDGE_BOTTOM] <= ball.x <= hi[EDGE_BOTTOM]:
+                    ball.y = HEIGHT - BALL_RADIUS
+                    ball.vy = -ball.vy
+                    self._on_hit(EDGE_BOTTOM, ball)
                 else:
                     scored = "A"
+                    missed = EDGE_BOTTOM
             # LEFT edge (belongs to B)
-            if ball["vx"] < 0 and ball["x"] - BALL_RADIUS <= 0:
-                pr = paddle_rect("left", self.paddles["left"])
-                if rect_contains_y(pr, ball["y"]):
-                    ball["x"] = BALL_RADIUS
-                    reflect_ball(ball, "x")
+            if ball.vx < 0 and ball.x - BALL_RADIUS <= 0:
+                if lo[EDGE_LEFT] <= ball.y <= hi[EDGE_LEFT]:
+                    ball.x = BALL_RADIUS
+                    ball.vx = -ball.vx
+                    self._on_hit(EDGE_LEFT, ball)
                 else:
                     scored = "A"
+                    missed = EDGE_LEFT
             # RIGHT edge (belongs to A)
-            elif ball["vx"] > 0 and ball["x"] + BALL_RADIUS >= WIDTH:
-                pr = paddle_rect("right", self.paddles["right"])
-                if rect_contains_y(pr, ball["y"]):
-                    ball["x"] = WIDTH - BALL_RADIUS
-                    reflect_ball(ball, "x")
+            elif ball.vx > 0 and ball.x + BALL_RADIUS >= WIDTH:
+                if lo[EDGE_RIGHT] <= ball.y <= hi[EDGE_RIGHT]:
+                    ball.x = WIDTH - BALL_RADIUS
+                    ball.vx = -ball.vx
+                    self._on_hit(EDGE_RIGHT, ball)
                 else:
                     scored = "B"
+                    missed = EDGE_RIGHT
 
         if scored:
             if scored == "A":
                 self.scoreA += 1
             else:
                 self.scoreB += 1
+            t = self._match_time()
+            self.events.emit("score", t=t, scorer=scored, edge=EDGE_NAMES[missed],
+                             score={"A": self.scoreA, "B": self.scoreB},
+                             rally_hits=self._rally_hits, rally_time=round(t - self._rally_start, 3))
+            self._rally_hits = 0
+            self._rally_start = t
             # reset all balls to center with new random directions
             for b in self.balls:
-                reset_ball(b)
+                b.reset()
+
+    def _snapshot(self):
+        return {
+            "version": CHECKPOINT_VERSION,
+            "match": self.events.match_id,
+            "num_balls": self.num_balls,
+            "target_score": self.target_score,
+            "time_limit": self.time_limit,
+            "paddles": paddles_to_dict(self.paddles),
+            "balls": [b.to_dict() for b in self.balls],
+            "score": [self.scoreA, self.scoreB],
+            "paused": self.paused,
+            "elapsed": time.time() - self.start_time if self.start_time is not None else self._resume_elapsed,
+            "sim_time": self._sim_time,
+            "saved_at": time.time(),
+        }
+
+    def _match_time(self):
+        # simulated time, so events carry real timings whether or not _run() drives the loop
+        return round(self._sim_time, 3)
+
+    def _on_hit(self, edge, ball):
+        self._rally_hits += 1
+        self.events.emit("hit", t=self._match_time(), edge=EDGE_NAMES[edge],
+                         x=round(ball.x, 1), y=round(ball.y, 1), rally_hits=self._rally_hits)
 
     def _make_state_obj(self, kind="state"):
         elapsed = 0
@@ -191,8 +325,8 @@ class GameServer:
             remaining = max(0, self.time_limit - int(elapsed)) if self.time_limit > 0 else None
         return {
             "type": kind,
-            "paddles": self.paddles,
-            "balls": self.balls,
+            "paddles": paddles_to_dict(self.paddles),
+            "balls": [b.to_dict() for b in self.balls],
             "score": {"A": self.scoreA, "B": self.scoreB},
             "paused": self.paused,
             "width": WIDTH, "height": HEIGHT,
@@ -207,6 +341,8 @@ class GameServer:
         if self.target_score and (self.scoreA >= self.target_score or self.scoreB >= self.target_score):
             winner = "A" if self.scoreA > self.scoreB else "B"
             self._broadcast({"type":"game_over","winner":winner,"score":{"A":self.scoreA,"B":self.scoreB}})
+            self.events.emit("game_over", t=self._match_time(), winner=winner, reason="score",
+                             score={"A": self.scoreA, "B": self.scoreB})
             return True
         if self.time_limit > 0 and self.start_time is not None:
             elapsed = time.time() - self.start_time
@@ -216,6 +352,8 @@ class GameServer:
                 elif self.scoreB > self.scoreA: winner = "B"
                 else: winner = "draw"
                 self._broadcast({"type":"game_over","winner":winner,"score":{"A":self.scoreA,"B":self.scoreB}})
+                self.events.emit("game_over", t=self._match_time(), winner=winner, reason="time",
+                                 score={"A": self.scoreA, "B": self.scoreB})
                 return True
         return False
 
@@ -232,30 +370,21 @@ class GameServer:
             listener.close()
             return
 
-        # Spawn client recv thread
+        # Spawn client recv thread + send settings
         if self.client_sock:
-            th = threading.Thread(target=self._recv_client_loop, name="ServerClientRecv", daemon=True)
-            th.start()
-            # send settings + initial state
-            send_json_line(self.client_sock, {
-                "type":"settings",
-                "width": WIDTH, "height": HEIGHT,
-                "num_balls": self.num_balls,
-                "target_score": self.target_score,
-                "time_limit": self.time_limit
-            })
+            self._greet_client()
 
-        # Announce start to both (host via latest_state)
-        self.start_time = time.time()
+        # Announce start to both (host via latest_state); a restored match keeps its clock
+        self.start_time = time.time() - self._resume_elapsed
         start_state = self._make_state_obj(kind="start")
         self._broadcast(start_state)
-        if self.client_sock:
-            send_json_line(self.client_sock, start_state)
+        listener.setblocking(False)
 
         # Physics loop
         last = time.perf_counter()
         acc = 0.0
         dt = 1.0 / TICK_RATE
+        last_ckpt = last
         while not self._stop.is_set():
             now = time.perf_counter()
             acc += (now - last)
@@ -273,8 +402,18 @@ class GameServer:
             self._broadcast(st)
 
             if self._check_gameover():
+                if self._checkpointer:
+                    self._checkpointer.clear()
                 break
 
+            if self._checkpointer and now - last_ckpt >= self._checkpoint_interval:
+                self._checkpointer.submit(self._snapshot())
+                last_ckpt = now
+
+            # Returning client (e.g. after its link dropped or our restart): resync with a keyframe
+            if self.client_sock is None and self._poll_accept(listener):
+                self._greet_client()
+
             time.sleep(0.001)  # be gentle
 
         try:
@@ -0,0 +1,180 @@
+import numpy as np
+from .common import (
+    WIDTH, HEIGHT, BALL_RADIUS, BALL_SPEED, PADDLE_SPEED, PADDLE_LEN,
+    TICK_RATE, EDGE_NAMES, EDGE_SPAN,
+    EDGE_TOP as TOP, EDGE_RIGHT as RIGHT, EDGE_BOTTOM as BOTTOM, EDGE_LEFT as LEFT
+)
+
+# Paddle / action columns in the batched arrays follow the common edge ids
+_EDGE_SPAN = np.array(EDGE_SPAN, dtype=np.float64)
+
+
+class VecPongEnv:
+    """
+    Batched, headless version of the GameServer physics for training bots:
+      - Holds N independent matches as numpy arrays (no per-match objects)
+      - step(actions) advances every match by one fixed tick
+      - actions: int array (N,4) of -1|0|1 for (top, right, bottom, left)
+      - Returns obs (N, obs_size), rewards (N,2) for (A,B), dones (N,), info
+      - Finished matches are reset automatically from the seeded RNG;
+        info["final_obs"] holds their pre-reset terminal observation
+      - info["truncated"] marks dones caused by the time limit rather than the
+        target score (bootstrap from final_obs for those)
+
+    Rewards come from score changes: +1 to the scorer, -1 to the other side.
+    """
+    def __init__(self, num_envs, num_balls=1, target_score=5, time_limit=0,
+                 dt=1.0 / TICK_RATE, seed=None):
+        self.num_envs = num_envs
+        self.num_balls = num_balls
+        self.target_score = target_score
+        self.time_limit = time_limit  # seconds of simulated time; 0 means no limit
+        self.dt = dt
+        self.max_steps = int(round(time_limit / dt)) if time_limit > 0 else 0
+        self.obs_size = 4 + 4 * num_balls + 2
+
+        n, b = num_envs, num_balls
+        self.paddles = np.empty((n, 4), dtype=np.float64)   # centers, edge id order
+        self.bx = np.empty((n, b), dtype=np.float64)
+        self.by = np.empty((n, b), dtype=np.float64)
+        self.bvx = np.empty((n, b), dtype=np.float64)
+        self.bvy = np.empty((n, b), dtype=np.float64)
+        self.scores = np.zeros((n, 2), dtype=np.int64)      # [:,0]=A, [:,1]=B
+        self.steps = np.zeros(n, dtype=np.int64)
+
+        self._lo = PADDLE_LEN / 2
+        self._hi = _EDGE_SPAN - PADDLE_LEN / 2
+        self.rng = None
+        self.reset(seed)
+
+    # --- Public API ---
+    def reset(self, seed=None):
+        """Reset every match. Passing a seed re-seeds the RNG; otherwise the current stream continues."""
+        if seed is not None or self.rng is None:
+            self.rng = np.random.default_rng(seed)
+        all_envs = np.ones(self.num_envs, dtype=bool)
+        self._reset_envs(all_envs)
+        return self._observe()
+
+    def step(self, actions):
+        actions = np.clip(np.asarray(actions), -1, 1)
+        if actions.shape != (self.num_envs, 4):
+            raise ValueError("actions must have shape (num_envs, 4)")
+        dt = self.dt
+
+        # Paddles
+        np.clip(self.paddles + actions * (PADDLE_SPEED * dt), self._lo, self._hi, out=self.paddles)
+
+        # Balls
+        self.bx += self.bvx * dt
+        self.by += self.bvy * dt
+        scored = np.zeros(self.num_envs, dtype=np.int8)  # 0 none, 1 A, 2 B
+        p = self.paddles
+        for i in range(self.num_balls):
+            scored = self._collide(i, p, scored)
+
+        # Score changes (matches the server: one point per tick, then reset balls)
+        a_scored = scored == 1
+        b_scored = scored == 2
+        self.scores[a_scored, 0] += 1
+        self.scores[b_scored, 1] += 1
+        rewards = np.zeros((self.num_envs, 2), dtype=np.float32)
+        rewards[a_scored] = (1.0, -1.0)
+        rewards[b_scored] = (-1.0, 1.0)
+        self.steps += 1
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        if self.target_score:
+            terminated = (self.scores >= self.target_score).any(axis=1)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_steps:
+            truncated = (self.steps >= self.max_steps) & ~terminated
+        dones = terminated | truncated
+
+        # Terminal observations are taken before any ball/match reset
+        info = {"truncated": truncated}
+        if dones.any():
+            info["final_obs"] = self._observe()[dones]
+            info["final_score"] = self.scores[dones].copy()
+
+        serve = (scored != 0) & ~dones
+        if serve.any():
+            self._reset_balls(serve)
+        if dones.any():
+            self._reset_envs(dones)
+        return self._observe(), rewards, dones, info
+
+    def to_state(self, index):
+        """Return match 'index' in the same dict layout as GameServer state snapshots."""
+        return {
+            "paddles": {e: float(self.paddles[index, k]) for k, e in enumerate(EDGE_NAMES)},
+            "balls": [
+                {"x": float(self.bx[index, i]), "y": float(self.by[index, i]),
+                 "vx": float(self.bvx[index, i]), "vy": float(self.bvy[index, i])}
+                for i in range(self.num_balls)
+            ],
+            "score": {"A": int(self.scores[index, 0]), "B": int(self.scores[index, 1])},
+        }
+
+    # --- Internals ---
+    def _collide(self, i, p, scored):
+        x, y = self.bx[:, i], self.by[:, i]
+        vx, vy = self.bvx[:, i], self.bvy[:, i]
+        half = PADDLE_LEN / 2
+
+        # TOP edge (belongs to A) / BOTTOM edge (belongs to B)
+        hit_top = (vy < 0) & (y - BALL_RADIUS <= 0)
+        hit_bot = ~hit_top & (vy > 0) & (y + BALL_RADIUS >= HEIGHT)
+        cover_top = np.abs(x - p[:, TOP]) <= half
+        cover_bot = np.abs(x - p[:, BOTTOM]) <= half
+        bounce = hit_top & cover_top
+        y[bounce] = BALL_RADIUS
+        vy[bounce] *= -1
+        bounce = hit_bot & cover_bot
+        y[bounce] = HEIGHT - BALL_RADIUS
+        vy[bounce] *= -1
+        scored = np.where(hit_top & ~cover_top, 2, scored)
+        scored = np.where(hit_bot & ~cover_bot, 1, scored)
+
+        # LEFT edge (belongs to B) / RIGHT edge (belongs to A)
+        hit_left = (vx < 0) & (x - BALL_RADIUS <= 0)
+        hit_right = ~hit_left & (vx > 0) & (x + BALL_RADIUS >= WIDTH)
+        cover_left = np.abs(y - p[:, LEFT]) <= half
+        cover_right = np.abs(y - p[:, RIGHT]) <= half
+        bounce = hit_left & cover_left
+        x[bounce] = BALL_RADIUS
+        vx[bounce] *= -1
+        bounce = hit_right & cover_right
+        x[bounce] = WIDTH - BALL_RADIUS
+        vx[bounce] *= -1
+        scored = np.where(hit_left & ~cover_left, 1, scored)
+        scored = np.where(hit_right & ~cover_right, 2, scored)
+        return scored.astype(np.int8, copy=False)
+
+    def _reset_balls(self, mask):
+        k = int(mask.sum())
+        self.bx[mask] = WIDTH / 2
+        self.by[mask] = HEIGHT / 2
+        # Same rule as random_ball_velocity: keep 12..78 degrees inside a random quadrant
+        quadrant = self.rng.integers(0, 4, size=(k, self.num_balls))
+        deg = self.rng.uniform(12.0, 78.0, size=(k, self.num_balls))
+        angle = np.radians(quadrant * 90.0 + deg)
+        self.bvx[mask] = BALL_SPEED * np.cos(angle)
+        self.bvy[mask] = BALL_SPEED * np.sin(angle)
+
+    def _reset_envs(self, mask):
+        self.paddles[mask] = _EDGE_SPAN / 2
+        self.scores[mask] = 0
+        self.steps[mask] = 0
+        self._reset_balls(mask)
+
+    def _observe(self):
+        # Normalized to roughly [-1, 1]: positions relative to center, velocities by BALL_SPEED
+        o = np.empty((self.num_envs, self.obs_size), dtype=np.float32)
+        b = self.num_balls
+        o[:, 0:4] = self.paddles / _EDGE_SPAN * 2 - 1
+        o[:, 4:4 + b] = self.bx / (WIDTH / 2) - 1
+        o[:, 4 + b:4 + 2 * b] = self.by / (HEIGHT / 2) - 1
+        o[:, 4 + 2 * b:4 + 3 * b] = self.bvx / BALL_SPEED
+        o[:, 4 + 3 * b:4 + 4 * b] = self.bvy / BALL_SPEED
+        o[:, 4 + 4 * b:] = self.scores / max(1, self.target_score)
+        return o
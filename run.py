@@ -5,8 +5,11 @@ import sys
 from game.server import GameServer
 from game.client import GameClient
 from game.game import run_pygame_loop
+from game.events import make_sink
+from game.checkpoint import load_checkpoint
 
 DEFAULT_PORT = 50007
+CHECKPOINT_PATH = "netpong_checkpoint.json"
 
 def start_game(settings):
     mode = settings.get("mode","local")
@@ -16,11 +19,12 @@ def start_game(settings):
     num_balls = settings["num_balls"]
     target_score = settings["target_score"]
     time_limit = settings["time_limit"]  # seconds; 0 = no limit
+    analytics = settings.get("analytics", "")  # .jsonl or .db path; empty = off
 
     if mode == "local":
         # Local single-screen multiplayer: instantiate server without network and run loop
         from game.server import GameServer
-        server = GameServer(port=settings.get("port",50007), num_balls=settings.get("num_balls",1), target_score=settings.get("target_score",5), time_limit=settings.get("time_limit",0))
+        server = GameServer(port=settings.get("port",50007), num_balls=settings.get("num_balls",1), target_score=settings.get("target_score",5), time_limit=settings.get("time_limit",0), event_sink=make_sink(analytics))
         # Run pygame loop in local mode (pass mode="local")
         try:
             run_pygame_loop(role="A", server=server, client=None, mode="local")
@@ -31,7 +35,13 @@ def start_game(settings):
 
     if role == "host":
         # Start server in background thread
-        server = GameServer(port=port, num_balls=num_balls, target_score=target_score, time_limit=time_limit)
+        server = GameServer(port=port, num_balls=num_balls, target_score=target_score, time_limit=time_limit, event_sink=make_sink(analytics),
+                            checkpoint_path=CHECKPOINT_PATH)
+        # Resume the last unfinished match (settings come from the checkpoint)
+        if settings.get("resume"):
+            snap = load_checkpoint(CHECKPOINT_PATH)
+            if snap is not None:
+                server.restore(snap)
         server.start()
         # Run local pygame loop as Player A (host)
         try:
@@ -59,6 +69,8 @@ def main():
     balls_var = tk.IntVar(value=1)
     target_var = tk.IntVar(value=5)
     timelimit_var = tk.IntVar(value=0)
+    analytics_var = tk.StringVar(value="")
+    resume_var = tk.BooleanVar(value=False)
 
     frm = ttk.Frame(root, padding=16)
     frm.grid(sticky="nsew")
@@ -93,8 +105,15 @@ def main():
     time_spin = ttk.Spinbox(frm, from_=0, to=3600, increment=30, textvariable=timelimit_var, width=8)
     time_spin.grid(row=5, column=1, sticky="w")
 
+    ttk.Label(frm, text="Analytics file (.jsonl/.db):").grid(row=6, column=0, sticky="w")
+    analytics_entry = ttk.Entry(frm, textvariable=analytics_var, width=18)
+    analytics_entry.grid(row=6, column=1, sticky="ew")
+
+    resume_chk = ttk.Checkbutton(frm, text="Resume last match (host)", variable=resume_var)
+    resume_chk.grid(row=7, column=0, columnspan=2, sticky="w")
+
     status_lbl = ttk.Label(frm, text="Tip: Host sets Port & rules. Client needs Host IP.")
-    status_lbl.grid(row=6, column=0, columnspan=2, sticky="w", pady=(8,0))
+    status_lbl.grid(row=8, column=0, columnspan=2, sticky="w", pady=(8,0))
 
     def on_role_change(*_):
         # disable ip/role when mode is local
@@ -120,6 +139,8 @@ def main():
                 num_balls=int(balls_var.get()),
                 target_score=int(target_var.get()),
                 time_limit=int(timelimit_var.get()),
+                analytics=analytics_var.get().strip(),
+                resume=bool(resume_var.get()),
             )
             if settings["role"] == "client" and not settings["host_ip"]:
                 messagebox.showerror("Error", "Please enter Host IP for client mode.")
@@ -132,7 +153,7 @@ def main():
         start_game(settings)
 
     start_btn = ttk.Button(frm, text="Start", command=on_start)
-    start_btn.grid(row=7, column=0, columnspan=2, pady=(12,0), sticky="ew")
+    start_btn.grid(row=9, column=0, columnspan=2, pady=(12,0), sticky="ew")
 
     root.mainloop()
 
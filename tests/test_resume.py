@@ -0,0 +1,121 @@
+import json, os, socket, tempfile, time, unittest
+from game.server import GameServer
+from game.checkpoint import load_checkpoint
+
+
+def _free_port():
+    s = socket.socket()
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+def _connect(port, timeout=2.0):
+    deadline = time.time() + timeout
+    while True:
+        try:
+            sock = socket.create_connection(("127.0.0.1", port), timeout=timeout)
+            sock.sendall(b'{"type":"hello","who":"client"}\n')
+            return sock
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.05)
+
+def _read_messages(sock, n):
+    f = sock.makefile("r", encoding="utf-8", newline="\n")
+    return [json.loads(f.readline()) for _ in range(n)]
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.time() + timeout
+    while not cond():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+class ResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ckpt.json")
+        self.port = _free_port()
+        self.servers = []
+        self.socks = []
+
+    def tearDown(self):
+        for s in self.socks:
+            try:
+                s.close()
+            except OSError:
+                pass
+        for srv in self.servers:
+            srv.stop()
+            if srv._thread:
+                srv._thread.join(timeout=2.0)
+        self.tmp.cleanup()
+
+    def _server(self, **kw):
+        srv = GameServer(port=self.port, target_score=0, checkpoint_path=self.path,
+                         checkpoint_interval=0.05, **kw)
+        self.servers.append(srv)
+        return srv
+
+    def _client(self):
+        sock = _connect(self.port)
+        self.socks.append(sock)
+        return sock
+
+    def test_restored_server_sends_settings_then_keyframe(self):
+        s1 = self._server(num_balls=2)
+        s1.start()
+        self._client()
+        self.assertTrue(_wait_for(lambda: s1.start_time is not None))
+        s1.set_input_A({"top": 1, "right": -1})
+        time.sleep(0.3)
+        s1.scoreA, s1.scoreB = 3, 2
+        self.assertTrue(_wait_for(lambda: (load_checkpoint(self.path) or {}).get("score") == [3, 2]))
+        s1.stop()
+        s1._thread.join(timeout=2.0)
+
+        t = time.perf_counter()
+        snap = load_checkpoint(self.path)
+        self.assertLess(time.perf_counter() - t, 0.05)
+        self.assertEqual(snap["score"], [3, 2])
+
+        s2 = self._server()
+        s2.restore(snap)
+        s2.start()
+        settings, start = _read_messages(self._client(), 2)
+        self.assertEqual(settings["type"], "settings")
+        self.assertEqual(settings["num_balls"], 2)
+        self.assertEqual(start["type"], "start")
+        self.assertEqual(start["score"], {"A": 3, "B": 2})
+        self.assertEqual(start["paddles"], snap["paddles"])
+        self.assertEqual(len(start["balls"]), 2)
+
+    def test_client_dropping_mid_match_does_not_kill_tick_thread(self):
+        srv = self._server()
+        srv.start()
+        first = self._client()
+        self.assertTrue(_wait_for(lambda: srv.start_time is not None))
+        first.close()
+
+        # Connect-and-drop repeatedly while the match is running
+        for _ in range(20):
+            sock = _connect(self.port)
+            sock.close()
+            time.sleep(0.01)
+        self.assertTrue(srv._thread.is_alive())
+
+        srv.scoreB = 4
+        sock = self._client()
+        settings, start = _read_messages(sock, 2)
+        self.assertEqual(settings["type"], "settings")
+        self.assertEqual(start["type"], "start")
+        self.assertEqual(start["score"]["B"], 4)
+        self.assertTrue(srv._thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()